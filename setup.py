@@ -11,6 +11,9 @@ setup(
         "python-dotenv",
         "rich",
     ],
+    extras_require={
+        "arrow": ["pyarrow"],
+    },
     entry_points={
         "console_scripts": ["snowflake_manager=snowflake_manager.cli:main"],
     },
@@ -1,3 +1,7 @@
-from dotenv import load_dotenv
+def __getattr__(name):
+    # Imported lazily to keep importing the package (e.g. by the CLI) fast
+    if name == "SnowflakeManager":
+        from snowflake_manager.manager import SnowflakeManager
 
-load_dotenv()
+        return SnowflakeManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
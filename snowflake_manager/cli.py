@@ -2,39 +2,63 @@ import argparse
 import logging
 import sys
 
-from rich.console import Console
-from rich.logging import RichHandler
-
-from snowflake_manager.core import drop_create_objects
+# Heavy dependencies (Snowflake connector, rich, yaml) are imported lazily by the
+# subcommands that need them, to keep `--help` and argument errors fast
+from snowflake_manager.fingerprints import (
+    compute_fingerprints,
+    get_entities_to_run,
+    load_fingerprints,
+    save_fingerprints,
+)
+from snowflake_manager.reporters import REPORTERS, get_reporter
+from snowflake_manager.sharding import build_shard_commands
 from snowflake_manager.utils import (
+    ParallelCommandsError,
     run_command,
+    run_commands_in_parallel,
     log_dry_run_info,
 )
 
-
-logging.basicConfig(
-    level="WARN", format="%(message)s", datefmt="[%X]", handlers=[RichHandler()]
-)
 log = logging.getLogger(__name__)
 log.setLevel("INFO")
-console = Console()
 
 
-def drop_create(args):
-    console.log("[bold][purple]Drop/create Snowflake objects[/purple] started[/bold]")
+def configure_logging(output: str):
+    handlers = None
+    if output == "rich":
+        from rich.logging import RichHandler
+
+        handlers = [RichHandler()]
+    logging.basicConfig(
+        level="WARN", format="%(message)s", datefmt="[%X]", handlers=handlers
+    )
+
+
+def drop_create(args, reporter):
+    from snowflake_manager.manager import SnowflakeManager
+
+    reporter.log("[bold][purple]Drop/create Snowflake objects[/purple] started[/bold]")
     if args.dry:
-        log_dry_run_info()
-    is_success = drop_create_objects(args.permifrost_spec_path, args.dry)
+        log_dry_run_info(reporter)
+    with SnowflakeManager(
+        args.permifrost_spec_path,
+        reporter,
+        args.base_ref,
+        args.columnar,
+        args.skip_create_only_inspection,
+    ) as manager:
+        is_success = manager.apply(args.dry)
     if is_success:
-        console.log(
+        reporter.log(
             "[bold][purple]\nDrop/create Snowflake objects[/purple] completed successfully[/bold]\n"
         )
     else:
         sys.exit(1)
+    return manager
 
 
-def permifrost(args):
-    console.log("[bold][purple]Permifrost[/purple] started[/bold]")
+def permifrost(args, reporter, changed_objects=None):
+    reporter.log("[bold][purple]Permifrost[/purple] started[/bold]")
     cmd = [
         "permifrost",
         "run",
@@ -44,16 +68,59 @@ def permifrost(args):
 
     if args.dry:
         cmd.append("--dry")
-        log_dry_run_info()
+        log_dry_run_info(reporter)
+
+    permifrost_spec = None
+    if args.shards > 1 or args.fingerprints_path:
+        from yaml import load, Loader
+
+        permifrost_spec = load(open(args.permifrost_spec_path, "r"), Loader=Loader)
+
+    # Roles and users to run Permifrost for, all of them if None
+    roles = users = fingerprints = None
+    if args.fingerprints_path:
+        fingerprints = compute_fingerprints(permifrost_spec)
+        previous_fingerprints = load_fingerprints(args.fingerprints_path)
+        if previous_fingerprints is None:
+            reporter.log("No fingerprints of a previous run found")
+        else:
+            entities = get_entities_to_run(
+                permifrost_spec, previous_fingerprints, fingerprints, changed_objects
+            )
+            roles, users = entities["roles"], entities["users"]
+            if not roles and not users:
+                reporter.log(
+                    "No roles or users changed since the last run, skipping Permifrost\n"
+                )
+                return
+            reporter.log(
+                f"Running Permifrost for {len(roles)} changed roles and {len(users)} changed users"
+            )
+
+    if args.shards > 1:
+        commands = build_shard_commands(cmd, permifrost_spec, args.shards, roles, users)
+        reporter.log(
+            f"Running command in {len(commands)} parallel processes ({', '.join(commands)}): \n[italic]{' '.join(cmd)}[/italic]\n"
+        )
+        try:
+            run_commands_in_parallel(commands, reporter, args.max_workers)
+        except ParallelCommandsError as e:
+            reporter.log(f"\n[bold][red]ERROR[/red][/bold]: {e}")
+            sys.exit(1)
+    else:
+        cmd += [arg for role in roles or [] for arg in ["--role", role]]
+        cmd += [arg for user in users or [] for arg in ["--user", user]]
+        reporter.log(f"Running command: \n[italic]{' '.join(cmd)}[/italic]\n")
+        run_command(cmd, reporter)
 
-    console.log(f"Running command: \n[italic]{' '.join(cmd)}[/italic]\n")
-    run_command(cmd)
-    console.log("[bold][purple]Permifrost[/purple] completed successfully[bold]\n")
+    if fingerprints and not args.dry:
+        save_fingerprints(args.fingerprints_path, fingerprints)
+    reporter.log("[bold][purple]Permifrost[/purple] completed successfully[bold]\n")
 
 
-def run(args):
-    drop_create(args)
-    permifrost(args)
+def run(args, reporter):
+    manager = drop_create(args, reporter)
+    permifrost(args, reporter, manager.get_created_and_dropped_objects())
 
 
 def main():
@@ -62,32 +129,83 @@ def main():
     )
     subparsers = parser.add_subparsers()
 
-    # Drop/create functionality
-    parser_drop_create = subparsers.add_parser("drop_create")
-    parser_drop_create.add_argument(
+    # Options shared by subcommands, attached with `parents` to keep them in sync
+    common_options = argparse.ArgumentParser(add_help=False)
+    common_options.add_argument(
         "-p", "--permifrost_spec_path", "--filepath", required=True
     )
-    parser_drop_create.add_argument("--dry", action="store_true")
+    common_options.add_argument("--dry", action="store_true")
+    common_options.add_argument(
+        "--output",
+        choices=list(REPORTERS),
+        default="rich",
+        help="Output format, plain and jsonl are faster for large numbers of statements",
+    )
+
+    drop_create_options = argparse.ArgumentParser(add_help=False)
+    # Columnar mode inspects all objects, so it cannot be used with a base ref
+    inspection_mode = drop_create_options.add_mutually_exclusive_group()
+    inspection_mode.add_argument(
+        "--base-ref",
+        help="Git ref of the base spec; only objects changed since then are checked",
+    )
+    inspection_mode.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Inspect and compare objects as Arrow tables, faster for large accounts (requires pyarrow)",
+    )
+    drop_create_options.add_argument(
+        "--skip-create-only-inspection",
+        action="store_true",
+        help="Do not inspect schemas, which are never dropped, and create them with CREATE SCHEMA IF NOT EXISTS instead",
+    )
+
+    permifrost_options = argparse.ArgumentParser(add_help=False)
+    permifrost_options.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Split roles into this many shards and run Permifrost for them in parallel, plus one process for all users",
+    )
+    permifrost_options.add_argument(
+        "--max-workers",
+        type=int,
+        help="Maximum number of Permifrost processes running at the same time",
+    )
+    permifrost_options.add_argument(
+        "--fingerprints-path",
+        help="File to store fingerprints of roles and users, to only run Permifrost for the ones that changed since the last run",
+    )
+
+    # Drop/create functionality
+    parser_drop_create = subparsers.add_parser(
+        "drop_create", parents=[common_options, drop_create_options]
+    )
     parser_drop_create.set_defaults(func=drop_create)
 
     # Permifrost functionality
-    parser_drop_create = subparsers.add_parser("permifrost")
-    parser_drop_create.add_argument(
-        "-p", "--permifrost_spec_path", "--filepath", required=True
+    parser_drop_create = subparsers.add_parser(
+        "permifrost", parents=[common_options, permifrost_options]
     )
-    parser_drop_create.add_argument("--dry", action="store_true")
     parser_drop_create.set_defaults(func=permifrost)
 
     # Run both
-    parser_drop_create = subparsers.add_parser("run")
-    parser_drop_create.add_argument(
-        "-p", "--permifrost_spec_path", "--filepath", required=True
+    parser_drop_create = subparsers.add_parser(
+        "run", parents=[common_options, drop_create_options, permifrost_options]
     )
-    parser_drop_create.add_argument("--dry", action="store_true")
     parser_drop_create.set_defaults(func=run)
 
     args = parser.parse_args()
-    args.func(args)
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    configure_logging(args.output)
+    reporter = get_reporter(args.output)
+    try:
+        args.func(args, reporter)
+    finally:
+        reporter.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+from typing import Dict, FrozenSet
+
+from snowflake_manager.constants import CREATE_ONLY_OBJECT_TYPES, DDL_ROLE
+from snowflake_manager.core import (
+    alter_template,
+    create_template,
+    drop_template,
+    objects_to_ignore_in_alter,
+    params_to_ignore_in_alter,
+)
+from snowflake_manager.inspector import parameter_name_map
+from snowflake_manager.objects import SnowflakeObject
+from snowflake_manager.utils import format_params, plural
+
+
+def import_pyarrow():
+    """Import pyarrow, an optional dependency only needed for the columnar mode"""
+    try:
+        import pyarrow
+        import pyarrow.compute
+    except ImportError as e:
+        raise ImportError(
+            "The columnar mode requires pyarrow: pip install 'snowflake_manager[arrow]'"
+        ) from e
+    return pyarrow, pyarrow.compute
+
+
+def encode_value(value) -> str:
+    """Encode a parameter value of the spec so it can be compared with `encode_column`.
+
+    Values compare like in `resolve_objects`, where booleans are equal to numbers
+    (`True == 1`) and strings are not equal to numbers (`"60" != 60`).
+    """
+    if value is None:
+        return "none"
+    if isinstance(value, (bool, int, float)):
+        number = float(value)
+        return f"n:{int(number)}" if number.is_integer() else f"n:{number}"
+    if isinstance(value, str):
+        return f"s:{value}"
+    return f"o:{value}"
+
+
+def encode_column(column):
+    """Normalize and encode a column of a SHOW query with vectorized kernels.
+
+    Strings are stripped and lower cased, and "true"/"false" are treated as booleans,
+    like `utils.treat_metadata_value` does for each value in `inspect_object_type`.
+    """
+    pa, pc = import_pyarrow()
+    if pa.types.is_dictionary(column.type):
+        column = column.cast(column.type.value_type)
+
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.utf8_lower(pc.utf8_trim_whitespace(column))
+        encoded = pc.if_else(
+            pc.equal(column, "true"),
+            "n:1",
+            pc.if_else(
+                pc.equal(column, "false"),
+                "n:0",
+                pc.binary_join_element_wise("s:", column, ""),
+            ),
+        )
+    elif pa.types.is_boolean(column.type):
+        encoded = pc.if_else(column, "n:1", "n:0")
+    elif pa.types.is_integer(column.type):
+        encoded = pc.binary_join_element_wise("n:", column.cast(pa.string()), "")
+    elif pa.types.is_decimal(column.type) or pa.types.is_floating(column.type):
+        # Integral values are encoded as integers, like `encode_value` does, so that
+        # e.g. Decimal("60.00") matches 60 in the spec
+        number = column.cast(pa.float64())
+        is_integral = pc.and_(pc.is_finite(number), pc.equal(pc.floor(number), number))
+        integral = pc.cast(pc.floor(number), pa.int64(), safe=False)
+        encoded = pc.binary_join_element_wise(
+            "n:",
+            pc.if_else(
+                is_integral, integral.cast(pa.string()), number.cast(pa.string())
+            ),
+            "",
+        )
+    else:
+        encoded = pc.binary_join_element_wise("o:", column.cast(pa.string()), "")
+
+    return pc.fill_null(encoded, "none")
+
+
+def inspect_object_type_arrow(cursor, object_type: str):
+    """Get Snowflake objects of a given type from Snowflake metadata as an Arrow table.
+
+    SHOW queries do not return Arrow results, so their results are fetched again with
+    `RESULT_SCAN`. Names are normalized like in `inspect_object_type` (schemas are
+    fully qualified e.g. `ANALYTICS.REPORTING`), and other columns are encoded with
+    `encode_column` and renamed to their DDL parameter names.
+
+    Args:
+        cursor: Snowflake API cursor object
+        object_type: Object type e.g. "database", "user", etc
+
+    Returns:
+        inspected_objects: Arrow table with a `name` column and a column per parameter
+    """
+    pa, pc = import_pyarrow()
+    cursor.execute(f"USE ROLE {DDL_ROLE}")
+    if object_type == "schema":
+        cursor.execute("SHOW SCHEMAS IN ACCOUNT")
+    else:
+        cursor.execute(f"SHOW {plural(object_type)}")
+    cursor.execute(f"SELECT * FROM TABLE(RESULT_SCAN('{cursor.sfqid}'))")
+    table = cursor.fetch_arrow_all(force_return_table=True)
+
+    if object_type == "schema":
+        names = pc.binary_join_element_wise(
+            pc.utf8_upper(table["database_name"]), pc.utf8_upper(table["name"]), "."
+        )
+        return pa.table({"name": names})
+
+    names = pc.utf8_lower(pc.utf8_trim_whitespace(table["name"]))
+    columns = {"name": names}
+    for column_name in table.column_names:
+        if column_name == "name":
+            continue
+        parameter_name = parameter_name_map.get(object_type, dict()).get(
+            column_name, column_name
+        )
+        columns[parameter_name] = encode_column(table[column_name])
+    table = pa.table(columns)
+
+    # Ignore Snowflake system objects
+    return table.filter(pc.invert(pc.starts_with(table["name"], "system$")))
+
+
+def resolve_objects_columnar(
+    existing_objects, ought_objects: FrozenSet[SnowflakeObject], object_type: str
+) -> Dict:
+    """Prepare DROP, CREATE and ALTER statements for an object type, like
+    `resolve_objects` but with the existing objects as an Arrow table.
+
+    Sets of objects to drop/create/keep and parameter mismatches are computed with
+    vectorized joins against a columnar form of the spec, so statements are only built
+    for the rows that need one.
+
+    Args:
+        existing_objects: Arrow table returned by `inspect_object_type_arrow`
+        ought_objects: Set of Snowflake objects that are expected to exist
+        object_type: Object type e.g. "database", "user", etc
+
+    Returns:
+        ddl_statements: dict with drop, create and alter keys with lists of DDL statments
+                        to be executed for the given object type, and a changed_names
+                        key with names of the objects that are created or dropped
+    """
+    pa, pc = import_pyarrow()
+    ddl_statements = {
+        "drop": [],
+        "create": [],
+        "alter": [],
+        "changed_names": [],
+    }
+
+    ought_by_name = {obj.name.lower(): obj for obj in ought_objects}
+    ought_names = pa.array(list(ought_by_name), type=pa.string())
+    existing_names = pc.utf8_lower(existing_objects["name"])
+
+    # Check which objects to drop/create/keep
+    if object_type not in CREATE_ONLY_OBJECT_TYPES:
+        to_drop = existing_objects["name"].filter(
+            pc.invert(pc.is_in(existing_names, value_set=ought_names))
+        )
+        ddl_statements["drop"] = [
+            drop_template.format(role=DDL_ROLE, object_type=object_type, name=name)
+            for name in to_drop.to_pylist()
+        ]
+        ddl_statements["changed_names"] += to_drop.to_pylist()
+    to_create = ought_names.filter(
+        pc.invert(pc.is_in(ought_names, value_set=existing_names))
+    )
+    ddl_statements["create"] = [
+        create_template.format(
+            role=DDL_ROLE,
+            object_type=object_type,
+            name=ought_by_name[name].name,
+            extra_sql=format_params(ought_by_name[name].params),
+        ).strip()
+        for name in to_create.to_pylist()
+    ]
+    ddl_statements["changed_names"] += [
+        ought_by_name[name].name for name in to_create.to_pylist()
+    ]
+
+    # Columnar form of the spec, with a column per parameter that is not ignored
+    params_to_ignore = params_to_ignore_in_alter.get(object_type, list())
+    objects_to_ignore = objects_to_ignore_in_alter.get(object_type, list())
+    ought_to_alter = [
+        obj
+        for name, obj in ought_by_name.items()
+        if obj.params and name not in objects_to_ignore
+    ]
+    param_names = sorted(
+        {p for obj in ought_to_alter for p in obj.params if p not in params_to_ignore}
+    )
+    if not param_names:
+        return ddl_statements
+    spec_table = pa.table(
+        {
+            "name": pa.array([obj.name.lower() for obj in ought_to_alter], pa.string()),
+            **{
+                f"ought_{p}": pa.array(
+                    [
+                        encode_value(obj.params[p]) if p in obj.params else None
+                        for obj in ought_to_alter
+                    ],
+                    pa.string(),
+                )
+                for p in param_names
+            },
+        }
+    )
+
+    # Prepare ALTER statements for the objects to keep with mismatching parameters
+    kept = spec_table.join(
+        existing_objects.set_column(0, "name", existing_names),
+        keys="name",
+        join_type="inner",
+    )
+    mismatches = {}
+    for p in param_names:
+        ought_column = kept[f"ought_{p}"]
+        if p in existing_objects.column_names:
+            mismatch = pc.not_equal(ought_column, kept[p])
+        else:  # Parameters missing in SHOW results always mismatch
+            mismatch = pc.is_valid(ought_column)
+        mismatches[p] = pc.fill_null(mismatch, False)
+
+    any_mismatch = pa.array([False] * kept.num_rows, pa.bool_())
+    for mismatch in mismatches.values():
+        any_mismatch = pc.or_(any_mismatch, mismatch)
+    rows_to_alter = pc.indices_nonzero(any_mismatch).to_pylist()
+    if not rows_to_alter:
+        return ddl_statements
+
+    names = kept["name"].to_pylist()
+    mismatches = {p: mismatch.to_pylist() for p, mismatch in mismatches.items()}
+    for i in rows_to_alter:
+        ought = ought_by_name[names[i]]
+        params_to_alter = {p: ought.params[p] for p in param_names if mismatches[p][i]}
+        ddl_statements["alter"].append(
+            alter_template.format(
+                role=DDL_ROLE,
+                object_type=object_type,
+                name=ought.name,
+                parameters=format_params(params_to_alter),
+            )
+        )
+
+    return ddl_statements
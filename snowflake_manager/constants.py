@@ -17,4 +17,7 @@ OBJECT_TYPE_MAP = {
 
 OBJECT_TYPES = list(OBJECT_TYPE_MAP.keys())
 
+# Object types that are created but never dropped
+CREATE_ONLY_OBJECT_TYPES = ["schema"]
+
 DDL_ROLE = "PERMIFROST"
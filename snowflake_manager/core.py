@@ -1,26 +1,22 @@
 import logging
 import os
-from typing import FrozenSet, Dict, List
+from typing import FrozenSet, Dict, List, Set
 
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.prompt import Prompt
-from yaml import load, Loader
-
-from snowflake_manager.constants import DDL_ROLE, OBJECT_TYPES
-from snowflake_manager.inspector import inspect_object_type
-from snowflake_manager.objects import SnowflakeObject
-from snowflake_manager.parser import parse_object_type
-from snowflake_manager.utils import (
-    get_snowflake_cursor,
-    format_params,
+from snowflake_manager.constants import (
+    CREATE_ONLY_OBJECT_TYPES,
+    DDL_ROLE,
+    OBJECT_TYPES,
 )
+from snowflake_manager.objects import SnowflakeObject
+from snowflake_manager.reporters import Reporter
+from snowflake_manager.utils import format_params
 
 
-all_ddl_statements = {object_type: None for object_type in OBJECT_TYPES}
-
 drop_template = "USE ROLE {role};DROP {object_type} {name};"
 create_template = "USE ROLE {role};CREATE {object_type} {name} {extra_sql};"
+create_if_not_exists_template = (
+    "USE ROLE {role};CREATE {object_type} IF NOT EXISTS {name} {extra_sql};"
+)
 alter_template = "USE ROLE {role};ALTER {object_type} {name} SET {parameters};"
 
 objects_to_ignore_in_alter = {"user": ["snowflake"]}
@@ -29,16 +25,17 @@ params_to_ignore_in_alter = {
     "warehouse": ["initially_suspended", "statement_timeout_in_seconds"],
 }
 
+# Maximum number of idempotent statements sent to Snowflake in a single request
+ddl_batch_size = 500
+
 
-logging.basicConfig(
-    level="WARN", format="%(message)s", datefmt="[%X]", handlers=[RichHandler()]
-)
 log = logging.getLogger(__name__)
 log.setLevel("INFO")
-console = Console()
 
-# Compatible with GitHub, GitLab and Bitbucket
-IS_CI_RUN = os.getenv("CI") == "true"
+
+def is_ci_run() -> bool:
+    # Compatible with GitHub, GitLab and Bitbucket
+    return os.getenv("CI") == "true"
 
 
 def build_statements_list(
@@ -77,63 +74,152 @@ def build_statements_list(
     return statements_seq
 
 
-def print_ddl_statements(statements: Dict) -> None:
+def get_created_and_dropped_objects(statements: Dict) -> Dict[str, Set[str]]:
+    """Get names of the objects that are created or dropped by a dictionary of
+    statements with the structure returned by `resolve_objects` for each object type.
+
+    Objects created with `CREATE ... IF NOT EXISTS` without being inspected are not
+    included, as they most likely exist already.
+
+    Args:
+        statements: dict with object types as keys and dicts of statements as values
+
+    Returns:
+        changed_objects: dict with object types as keys and sets of names as values
+    """
+    return {
+        object_type: set(object_statements["changed_names"])
+        for object_type, object_statements in statements.items()
+        if object_statements
+    }
+
+
+def is_create_if_not_exists(statement: str) -> bool:
+    return statement.startswith("CREATE") and " IF NOT EXISTS " in statement
+
+
+def print_ddl_statements(statements: List, reporter: Reporter) -> None:
     """Print DDL statements to be executed."""
-    if not statements:
-        console.log(
-            "No statements to execute (the state of Snowflake objects matches the Permifrost spec)\n"
-        )
-        return
     for s in statements:
         if s.startswith("USE ROLE"):
             continue
-        console.log(f"[italic]- {s}[/italic]")
-    console.log()
+        if is_create_if_not_exists(s):
+            reporter.statement(s, note="may already exist")
+        else:
+            reporter.statement(s)
 
 
-def execute_ddl(cursor, statements: List) -> None:
+def execute_ddl_batch(cursor, statements: List, reporter: Reporter) -> None:
+    """Execute statements in a single multi-statement request."""
+    cursor.execute(";".join(statements), num_statements=len(statements))
+    for s in statements:
+        if s.startswith("USE ROLE"):
+            continue
+        reporter.executed(s)
+
+
+def execute_ddl(cursor, statements: List, reporter: Reporter) -> None:
     """Execute drop, create and alter statements in sequence for each object type.
 
+    Consecutive `CREATE ... IF NOT EXISTS` statements (and their `USE ROLE`
+    statements) are idempotent, so they are sent in batches of `ddl_batch_size`
+    statements instead of one request per statement.
+
     Args:
         cursor: Snowflake API cursor object
         statements: list with drop, create and alter statements in sequence for all
                     object types
+        reporter: reporter used to output the executed statements
     """
-    console.log("\n[bold]Executing DDL statements[/bold]:")
-    for s in statements:
+    batch = []
+    for i, s in enumerate(statements):
+        next_statement = statements[i + 1] if i + 1 < len(statements) else ""
+        if is_create_if_not_exists(s) or (
+            s.startswith("USE ROLE") and is_create_if_not_exists(next_statement)
+        ):
+            batch.append(s)
+            if len(batch) >= ddl_batch_size and is_create_if_not_exists(s):
+                execute_ddl_batch(cursor, batch, reporter)
+                batch = []
+            continue
+        if batch:
+            execute_ddl_batch(cursor, batch, reporter)
+            batch = []
+
         cursor.execute(s)
         if s.startswith("USE ROLE"):
             continue
-        console.log(f"[green]\u2713[/green] [italic]{s}[/italic]")
+        reporter.executed(s)
+
+    if batch:
+        execute_ddl_batch(cursor, batch, reporter)
+
+
+def resolve_create_only(
+    ought_objects: FrozenSet[SnowflakeObject], object_type: str
+) -> Dict:
+    """Prepare idempotent CREATE ... IF NOT EXISTS statements for a create-only object
+    type, without inspecting which objects already exist.
+
+    Args:
+        ought_objects: Set of Snowflake objects that are expected to exist
+        object_type: Object type e.g. "schema", one of `CREATE_ONLY_OBJECT_TYPES`
+
+    Returns:
+        ddl_statements: dict with drop, create and alter keys with lists of DDL statments
+                        to be executed for the given object type, and an empty
+                        changed_names key since objects may already exist
+    """
+    return {
+        "drop": [],
+        "create": [
+            create_if_not_exists_template.format(
+                role=DDL_ROLE,
+                object_type=object_type,
+                name=obj.name,
+                extra_sql=format_params(obj.params),
+            ).strip()
+            for obj in sorted(ought_objects)
+        ],
+        "alter": [],
+        "changed_names": [],
+    }
 
 
 def resolve_objects(
     existing_objects: FrozenSet[SnowflakeObject],
     ought_objects: FrozenSet[SnowflakeObject],
+    object_type: str = None,
 ) -> Dict:
     """Prepare DROP, CREATE and ALTER statements for an object type.
 
     Args:
         existing_objects: Set of Snowflake objects that currently exist
         ought_objects: Set of Snowflake objects that are expected to exist
+        object_type: Object type e.g. "database", inferred from the objects if omitted
 
     Returns:
         ddl_statements: dict with drop, create and alter keys with lists of DDL statments
-                        to be executed for the given object type
+                        to be executed for the given object type, and a changed_names
+                        key with names of the objects that are created or dropped
     """
     ddl_statements = {
         "drop": [],
         "create": [],
         "alter": [],
+        "changed_names": [],
     }
 
+    if not existing_objects and not ought_objects:
+        return ddl_statements
+
     # Infer type from arguments
-    object_type = list(existing_objects)[0].type
-    console.log(f"Resolving {object_type} objects")
+    if object_type is None:
+        object_type = next(iter(existing_objects | ought_objects)).type
 
     # Check which objects to drop/create/keep
     objects_to_drop = existing_objects.difference(ought_objects)
-    if object_type == "schema":  # Schemas should not be dropped
+    if object_type in CREATE_ONLY_OBJECT_TYPES:
         objects_to_drop = frozenset()
     objects_to_create = ought_objects.difference(existing_objects)
     objects_to_keep = ought_objects.intersection(existing_objects)
@@ -152,6 +238,9 @@ def resolve_objects(
         drop_template.format(role=DDL_ROLE, object_type=object_type, name=obj.name)
         for obj in objects_to_drop
     ]
+    ddl_statements["changed_names"] = sorted(
+        obj.name for obj in objects_to_drop.union(objects_to_create)
+    )
 
     # Prepare ALTER statements
     existing_objects_to_keep = sorted(
@@ -170,10 +259,14 @@ def resolve_objects(
         if existing.params == ought.params:
             continue
 
-        for p in params_to_ignore_in_alter.get(object_type, list()):
-            ought.params.pop(p, None)
-
-        ought_params_set = set(ought.params.items())
+        # Ignored parameters are filtered out without changing the ought objects, which
+        # may be reused for later runs
+        ought_params = {
+            p: value
+            for p, value in ought.params.items()
+            if p not in params_to_ignore_in_alter.get(object_type, list())
+        }
+        ought_params_set = set(ought_params.items())
         existing_params_set = set(existing.params.items())
         params_to_alter_set = ought_params_set.difference(existing_params_set)
         if not params_to_alter_set:
@@ -192,48 +285,30 @@ def resolve_objects(
     return ddl_statements
 
 
-def drop_create_objects(permifrost_spec_path: str, is_dry_run: bool):
+def drop_create_objects(
+    permifrost_spec_path: str,
+    is_dry_run: bool,
+    base_ref: str = None,
+    reporter: Reporter = None,
+    columnar: bool = False,
+    skip_create_only_inspection: bool = False,
+):
     """
     Drop and create Snowflake objects based on Permifrost specification and inspection of Snowflake metadata.
 
-    Args:
-        permifrost_spec_path: path to the Permifrost specification file
-        is_dry_run: flag to run the operation in dry-run mode
+    Runs once with a new `SnowflakeManager`, see its docstring for the arguments. Use
+    the manager directly to keep the connection and inspected objects between runs.
 
     Returns:
         bool: True if the operation was successful, False otherwise
     """
-    permifrost_spec = load(open(permifrost_spec_path, "r"), Loader=Loader)
-
-    for object_type in OBJECT_TYPES:
-        all_ddl_statements[object_type] = resolve_objects(
-            inspect_object_type(object_type),
-            parse_object_type(permifrost_spec, object_type),
-        )
-
-    console.log("\n[bold]DDL statements to be executed[/bold]:")
-    ddl_statements_seq = build_statements_list(all_ddl_statements)
-    print_ddl_statements(ddl_statements_seq)
-    drop_statements = [s for s in ddl_statements_seq if s.startswith("DROP")]
-
-    if IS_CI_RUN:
-        console.log(
-            "[bold][yellow]CI run detected[/bold][/yellow]: Skipping DROP confirmation"
-        )
-
-    if not is_dry_run and not IS_CI_RUN and drop_statements:
-        console.log(
-            f"\n[bold][red]WARNING[/bold][/red]: The following DROP statements are about to be executed: {(drop_statements)}"
-        )
-        user_input = Prompt.ask(
-            "\n\t>>> Type [bold]drop[/bold] to proceed or any other key to abort"
-        )
-        if user_input.lower() != "drop":
-            console.log()
-            console.log("Exited without executing any statements")
-            return False
-
-    if not is_dry_run:
-        execute_ddl(get_snowflake_cursor(), ddl_statements_seq)
-
-    return True
+    from snowflake_manager.manager import SnowflakeManager
+
+    with SnowflakeManager(
+        permifrost_spec_path,
+        reporter,
+        base_ref,
+        columnar,
+        skip_create_only_inspection,
+    ) as manager:
+        return manager.apply(is_dry_run)
@@ -0,0 +1,84 @@
+import os
+import subprocess
+from typing import FrozenSet
+
+from yaml import load, Loader
+
+from snowflake_manager.parser import parse_object_type
+
+
+def load_spec_at_ref(permifrost_spec_path: str, ref: str) -> dict:
+    """Load the Permifrost spec as it is at a given git ref (e.g. `origin/main`).
+
+    Args:
+        permifrost_spec_path: path to the Permifrost specification file
+        ref: git ref to read the file from
+
+    Returns:
+        permifrost_spec: Dict with contents from the Permifrost YAML file at `ref`,
+                         empty if the file did not exist at `ref`
+
+    Raises:
+        ValueError: if the git ref cannot be resolved (e.g. not fetched in a shallow
+                    clone)
+    """
+    process = subprocess.run(
+        ["git", "rev-parse", "--verify", "--end-of-options", f"{ref}^{{commit}}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise ValueError(
+            f"Could not resolve git ref '{ref}', make sure it is fetched: "
+            f"{process.stderr.strip()}"
+        )
+
+    # The "./" prefix makes git resolve the path relative to the working directory
+    relative_path = os.path.relpath(permifrost_spec_path)
+    process = subprocess.run(
+        ["git", "show", f"{ref}:./{relative_path}"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if process.returncode != 0:
+        # e.g. "path '...' does not exist in 'origin/main'" or "path '...' exists on
+        # disk, but not in 'origin/main'", the spec file was added after the ref
+        if "does not exist in" in process.stderr or "but not in" in process.stderr:
+            return {}
+        raise ValueError(
+            f"Could not read {relative_path} at git ref '{ref}': "
+            f"{process.stderr.strip()}"
+        )
+    return load(process.stdout, Loader=Loader) or {}
+
+
+def diff_object_type(
+    base_spec: dict, head_spec: dict, object_type: str
+) -> FrozenSet[str]:
+    """Get names of objects of a given type that differ between two Permifrost specs.
+
+    An object is considered changed if it was added, removed or had its parameters
+    modified between the base and the head spec.
+
+    Args:
+        base_spec: Dict with contents from the base Permifrost YAML file
+        head_spec: Dict with contents from the head Permifrost YAML file
+        object_type: Object type e.g. "database", "user", etc
+
+    Returns:
+        changed_names: set of names of the changed objects
+    """
+    base_objects = parse_object_type(base_spec, object_type)
+    head_objects = parse_object_type(head_spec, object_type)
+    base_params = {obj.name.lower(): obj.params for obj in base_objects}
+
+    changed_names = set()
+    for obj in head_objects:
+        if base_params.get(obj.name.lower(), None) != obj.params:
+            changed_names.add(obj.name)
+    for obj in base_objects.difference(head_objects):
+        changed_names.add(obj.name)
+
+    return frozenset(changed_names)
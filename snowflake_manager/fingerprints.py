@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Set
+
+
+def get_entity_specs(permifrost_spec: dict, entity_type: str) -> Dict[str, Dict]:
+    """Get the spec of each entity of a given type (e.g. "roles") keyed by its name"""
+    entity_specs = {}
+    for entity in permifrost_spec.get(entity_type) or []:
+        name = list(entity.keys())[0]
+        entity_specs[name] = entity[name] or {}
+    return entity_specs
+
+
+def get_role_references(role_spec: dict) -> Dict[str, Set[str]]:
+    """Get objects referenced by a role definition of the Permifrost spec.
+
+    All names are lower case. Schema names are fully qualified, e.g. `raw.stripe` or
+    `raw.*` for wildcards.
+
+    Args:
+        role_spec: Dict with the definition of a role in the Permifrost spec
+
+    Returns:
+        references: dict with object types as keys and sets of object names as values
+    """
+    references = {"warehouse": set(), "database": set(), "schema": set(), "role": set()}
+    references["warehouse"].update(w.lower() for w in role_spec.get("warehouses", []))
+
+    member_of = role_spec.get("member_of") or []
+    if isinstance(member_of, dict):
+        member_of = member_of.get("include", [])
+    references["role"].update(r.lower() for r in member_of)
+
+    # List of tuples: privilege type (e.g. "schemas"), list of object names
+    grants = list((role_spec.get("owns") or {}).items())
+    for privilege_type, access in (role_spec.get("privileges") or {}).items():
+        access = access or {}
+        names = (access.get("read") or []) + (access.get("write") or [])
+        grants.append((privilege_type, names))
+    for privilege_type, names in grants:
+        for name in names or []:
+            parts = name.split(".")
+            references["database"].add(parts[0].lower())
+            if privilege_type in ["schemas", "tables"]:
+                references["schema"].add(".".join(parts[:2]).lower())
+
+    return references
+
+
+def hash_spec(spec) -> str:
+    return hashlib.sha256(
+        json.dumps(spec, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def compute_fingerprints(permifrost_spec: dict) -> Dict[str, Dict[str, str]]:
+    """Compute a fingerprint for each role and user of the Permifrost spec.
+
+    The fingerprint of a role covers its own definition plus the definitions of the
+    warehouses and databases it references, so that a change to any of them makes
+    Permifrost run for the role again.
+
+    Args:
+        permifrost_spec: Dict with contents from Permifrost YAML file
+
+    Returns:
+        fingerprints: dict with "roles" and "users" keys, each with a dict of entity
+                      names and their fingerprints
+    """
+    warehouses = {
+        name.lower(): spec
+        for name, spec in get_entity_specs(permifrost_spec, "warehouses").items()
+    }
+    databases = {
+        name.lower(): spec
+        for name, spec in get_entity_specs(permifrost_spec, "databases").items()
+    }
+
+    role_fingerprints = {}
+    for name, role_spec in get_entity_specs(permifrost_spec, "roles").items():
+        references = get_role_references(role_spec)
+        role_fingerprints[name] = hash_spec(
+            {
+                "role": role_spec,
+                "warehouses": {w: warehouses.get(w) for w in references["warehouse"]},
+                "databases": {d: databases.get(d) for d in references["database"]},
+            }
+        )
+
+    user_fingerprints = {
+        name: hash_spec({"user": user_spec})
+        for name, user_spec in get_entity_specs(permifrost_spec, "users").items()
+    }
+
+    return {"roles": role_fingerprints, "users": user_fingerprints}
+
+
+def load_fingerprints(fingerprints_path: str) -> Dict[str, Dict[str, str]]:
+    """Load fingerprints stored by a previous run, returns None if there are none"""
+    if not os.path.exists(fingerprints_path):
+        return None
+    with open(fingerprints_path, "r") as f:
+        return json.load(f)
+
+
+def save_fingerprints(
+    fingerprints_path: str, fingerprints: Dict[str, Dict[str, str]]
+) -> None:
+    with open(fingerprints_path, "w") as f:
+        json.dump(fingerprints, f, indent=2, sort_keys=True)
+
+
+def get_entities_to_run(
+    permifrost_spec: dict,
+    previous_fingerprints: Dict[str, Dict[str, str]],
+    fingerprints: Dict[str, Dict[str, str]],
+    changed_objects: Dict[str, Set[str]] = None,
+) -> Dict[str, List[str]]:
+    """Get roles and users that Permifrost needs to run for.
+
+    These are the ones whose fingerprint changed since the previous run, plus the
+    ones affected by objects created or dropped in this run.
+
+    Args:
+        permifrost_spec: Dict with contents from Permifrost YAML file
+        previous_fingerprints: fingerprints stored by the previous successful run
+        fingerprints: fingerprints of the current Permifrost spec
+        changed_objects: dict with object types as keys and sets of names of the
+                         objects that were created or dropped as values
+
+    Returns:
+        entities: dict with "roles" and "users" keys, each with a sorted list of names
+    """
+    changed_objects = {
+        object_type: {name.lower() for name in names}
+        for object_type, names in (changed_objects or {}).items()
+    }
+    changed_schemas = changed_objects.get("schema", set())
+    changed_databases = changed_objects.get("database", set())
+    changed_roles = changed_objects.get("role", set())
+
+    entities = {}
+    for entity_type in ["roles", "users"]:
+        previous = previous_fingerprints.get(entity_type, {})
+        entities[entity_type] = {
+            name
+            for name, fingerprint in fingerprints[entity_type].items()
+            if previous.get(name) != fingerprint
+        }
+
+    for name, role_spec in get_entity_specs(permifrost_spec, "roles").items():
+        references = get_role_references(role_spec)
+        if (
+            name.lower() in changed_roles
+            or references["warehouse"] & changed_objects.get("warehouse", set())
+            or references["database"] & changed_databases
+            or references["role"] & changed_roles
+            or references["schema"] & changed_schemas
+            or references["schema"] & {s.split(".")[0] + ".*" for s in changed_schemas}
+        ):
+            entities["roles"].add(name)
+
+    for name, user_spec in get_entity_specs(permifrost_spec, "users").items():
+        member_of = {role.lower() for role in user_spec.get("member_of") or []}
+        is_changed_user = name.lower() in changed_objects.get("user", set())
+        if is_changed_user or member_of & changed_roles:
+            entities["users"].add(name)
+
+    return {entity_type: sorted(names) for entity_type, names in entities.items()}
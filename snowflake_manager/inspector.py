@@ -1,5 +1,5 @@
 from pprint import pprint
-from typing import FrozenSet
+from typing import Dict, FrozenSet, Iterable, List
 
 from snowflake_manager.constants import OBJECT_TYPES, OBJECT_TYPE_MAP, DDL_ROLE
 from snowflake_manager.objects import SnowflakeObject, Schema
@@ -13,22 +13,47 @@ parameter_name_map = {
     },
 }
 
-cursor = get_snowflake_cursor()
 
+def like_pattern(name: str) -> str:
+    """Returns a `SHOW ... LIKE` pattern for the given object name.
 
-def inspect_schemas() -> FrozenSet[Schema]:
+    Wildcards (`_`, `%`) are left as they are, so results must be filtered by exact
+    name afterwards.
+    """
+    return name.replace("'", "''")
+
+
+def inspect_schemas(cursor, names: Iterable[str] = None) -> FrozenSet[Schema]:
     """Get schemas that exist based on Snowflake metadata.
 
+    Args:
+        cursor: Snowflake API cursor object
+        names: optional fully qualified schema names (e.g. `ANALYTICS.REPORTING`) to
+               restrict the inspection to, using targeted `SHOW SCHEMAS LIKE` queries
+
     Returns:
         inspected_objects: set of instances of `SnowflakeObject` subclasses
     """
     # Keys are databases and values are list of schemas e.g. {'ANALYTICS': ['REPORTING']}
     existing_schemas = {}
     cursor.execute(f"USE ROLE {DDL_ROLE}")
-    cursor.execute("SHOW SCHEMAS IN ACCOUNT")
-    schemas_list = [
-        (row[4], row[1]) for row in cursor
-    ]  # List of tuples: database, schema
+    if names is None:
+        cursor.execute("SHOW SCHEMAS IN ACCOUNT")
+        schemas_list = [
+            (row[4], row[1]) for row in cursor
+        ]  # List of tuples: database, schema
+    else:
+        schemas_list = []
+        for name in names:
+            database_name, schema_name = name.upper().split(".")
+            cursor.execute(
+                f"SHOW SCHEMAS LIKE '{like_pattern(schema_name)}' IN ACCOUNT"
+            )
+            schemas_list.extend(
+                (row[4], row[1])
+                for row in cursor
+                if row[4].upper() == database_name and row[1].upper() == schema_name
+            )
     for database, schema in schemas_list:
         database = database.upper()
         schema = schema.upper()
@@ -44,28 +69,49 @@ def inspect_schemas() -> FrozenSet[Schema]:
     return frozenset([Schema(name=name) for name in existing_schema_names])
 
 
-def inspect_object_type(object_type: str) -> FrozenSet[SnowflakeObject]:
+def fetch_object_rows(cursor, object_type: str, query: str) -> List[Dict]:
+    """Run a SHOW query and return its rows as dicts keyed by DDL parameter names"""
+    cursor.execute(query)
+    desc = cursor.description
+    column_names = [
+        parameter_name_map.get(object_type, dict()).get(col[0], col[0]) for col in desc
+    ]
+    formatted_rows = [
+        tuple([treat_metadata_value(value) for value in row]) for row in cursor
+    ]
+    return [dict(zip(column_names, row)) for row in formatted_rows]
+
+
+def inspect_object_type(
+    cursor, object_type: str, names: Iterable[str] = None
+) -> FrozenSet[SnowflakeObject]:
     """Initialize Snowflake objects of a given type from Snowflake metadata.
 
     Args:
+        cursor: Snowflake API cursor object
         object_type: Object type e.g. "database", "user", etc
+        names: optional object names to restrict the inspection to, using targeted
+               `SHOW ... LIKE` queries instead of listing every object in the account
 
     Returns:
         inspected_objects: set of instances of `SnowflakeObject` subclasses
     """
     if object_type == "schema":
-        return inspect_schemas()
+        return inspect_schemas(cursor, names)
 
     cursor.execute(f"USE ROLE {DDL_ROLE}")
-    cursor.execute(f"SHOW {plural(object_type)}")
-    desc = cursor.description
-    column_names = [
-        parameter_name_map.get(object_type, dict()).get(col[0], col[0]) for col in desc
-    ]
-    formatted_rows = [
-        tuple([treat_metadata_value(value) for value in row]) for row in cursor
-    ]
-    data = [dict(zip(column_names, row)) for row in formatted_rows]
+    if names is None:
+        data = fetch_object_rows(cursor, object_type, f"SHOW {plural(object_type)}")
+    else:
+        data = []
+        for name in names:
+            rows = fetch_object_rows(
+                cursor,
+                object_type,
+                f"SHOW {plural(object_type)} LIKE '{like_pattern(name)}'",
+            )
+            # LIKE is case-insensitive, so only keep exact name matches
+            data.extend(row for row in rows if row["name"] == name.lower())
 
     inspected_objects = []
     for object in data:
@@ -79,10 +125,11 @@ def inspect_object_type(object_type: str) -> FrozenSet[SnowflakeObject]:
 
 
 def run():
+    cursor = get_snowflake_cursor()
     inspected_objects = {plural(object_type): None for object_type in OBJECT_TYPES}
 
-    inspected_objects["warehouses"] = inspect_object_type("warehouse")
-    inspected_objects["databases"] = inspect_object_type("database")
+    inspected_objects["warehouses"] = inspect_object_type(cursor, "warehouse")
+    inspected_objects["databases"] = inspect_object_type(cursor, "database")
 
     pprint(inspected_objects)
 
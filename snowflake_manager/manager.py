@@ -0,0 +1,306 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from snowflake_manager.constants import CREATE_ONLY_OBJECT_TYPES, OBJECT_TYPES
+from snowflake_manager.core import (
+    build_statements_list,
+    execute_ddl,
+    get_created_and_dropped_objects,
+    is_ci_run,
+    print_ddl_statements,
+    resolve_create_only,
+    resolve_objects,
+)
+from snowflake_manager.differ import diff_object_type, load_spec_at_ref
+from snowflake_manager.inspector import inspect_object_type
+from snowflake_manager.parser import parse_object_type
+from snowflake_manager.reporters import Reporter, get_reporter
+from snowflake_manager.utils import get_snowflake_connection
+
+
+class SnowflakeManager:
+    """Drop, create and alter Snowflake objects based on a Permifrost spec.
+
+    An instance holds its own Snowflake connection, parsed spec and inspected objects,
+    so it can be reused for repeated runs in a long-lived process (e.g. an Airflow
+    worker) without reconnecting or re-inspecting objects that did not change. Public
+    methods are thread-safe, calls on the same instance are serialized.
+
+    Attributes:
+        permifrost_spec_path: path to the Permifrost specification file
+        reporter: reporter used to output progress and statements
+        base_ref: optional git ref of the base Permifrost spec to diff against, to only
+                  inspect and resolve the objects that changed since then
+        columnar: flag to inspect and resolve objects as Arrow tables (requires
+                  pyarrow), cannot be used together with `base_ref`
+        skip_create_only_inspection: flag to create objects of create-only types (e.g.
+                                     schemas) with CREATE ... IF NOT EXISTS statements
+                                     instead of inspecting them
+        ddl_statements: statements of the last plan, with the structure returned by
+                        `resolve_objects` for each object type
+    """
+
+    def __init__(
+        self,
+        permifrost_spec_path: str,
+        reporter: Reporter = None,
+        base_ref: str = None,
+        columnar: bool = False,
+        skip_create_only_inspection: bool = False,
+        connection_factory: Callable = get_snowflake_connection,
+    ):
+        self.permifrost_spec_path = permifrost_spec_path
+        self.reporter = reporter or get_reporter()
+        self.base_ref = base_ref
+        if columnar and base_ref:
+            raise ValueError("Columnar mode cannot be used together with a base ref")
+        self.columnar = columnar
+        self.skip_create_only_inspection = skip_create_only_inspection
+        self.ddl_statements = {}
+
+        self._connection_factory = connection_factory
+        self._connection = None
+        self._lock = threading.RLock()
+        # Tuple of spec file modification time, spec and parsed objects by object type
+        self._spec_cache = None
+        # Inspected objects keyed by object type and inspected names (None for all)
+        self._inspected = {}
+
+        self._inspect, self._resolve = inspect_object_type, resolve_objects
+        if self.columnar:
+            from snowflake_manager.columnar import (
+                import_pyarrow,
+                inspect_object_type_arrow,
+                resolve_objects_columnar,
+            )
+
+            import_pyarrow()  # Fail before connecting if pyarrow is not installed
+            self._inspect = inspect_object_type_arrow
+            self._resolve = resolve_objects_columnar
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def connection(self):
+        """Snowflake connection, opened on first use and reopened if it was closed"""
+        with self._lock:
+            if self._connection is None or self._connection.is_closed():
+                self._connection = self._connection_factory()
+            return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def refresh(self) -> None:
+        """Discard the cached spec and inspected objects, so the next plan or apply
+        reloads the spec and inspects Snowflake again."""
+        with self._lock:
+            self._spec_cache = None
+            self._inspected = {}
+
+    def plan(self) -> Dict[str, Dict]:
+        """Resolve and print the DDL statements needed for Snowflake to match the spec.
+
+        Returns:
+            ddl_statements: dict with the structure returned by `resolve_objects` for
+                            each object type
+        """
+        with self._lock:
+            self.reporter.log("\n[bold]DDL statements to be executed[/bold]:")
+            statements_seq = []
+            for _, statements in self._iter_statements():
+                print_ddl_statements(statements, self.reporter)
+                statements_seq.extend(statements)
+            self._log_statements_summary(statements_seq)
+            return self.ddl_statements
+
+    def apply(self, is_dry_run: bool = False, confirm_drops: bool = None) -> bool:
+        """Drop, create and alter Snowflake objects to match the spec.
+
+        All object types are inspected and resolved, and the full list of statements
+        is printed, before the first statement is executed. A failed inspection leaves
+        Snowflake untouched.
+
+        Args:
+            is_dry_run: flag to only print the statements instead of executing them
+            confirm_drops: flag to ask for confirmation before executing DROP
+                           statements, defaults to asking unless running in CI
+
+        Returns:
+            bool: True if the operation was successful, False otherwise
+        """
+        if confirm_drops is None:
+            confirm_drops = not is_ci_run()
+            if not confirm_drops:
+                self.reporter.log(
+                    "[bold][yellow]CI run detected[/bold][/yellow]: Skipping DROP confirmation"
+                )
+
+        with self._lock:
+            self.plan()
+            if is_dry_run:
+                return True
+
+            statements_seq = build_statements_list(self.ddl_statements)
+            drop_statements = [s for s in statements_seq if s.startswith("DROP")]
+            if confirm_drops and drop_statements:
+                self.reporter.log(
+                    f"\n[bold][red]WARNING[/bold][/red]: The following DROP statements are about to be executed: {(drop_statements)}"
+                )
+                user_input = self.reporter.ask(
+                    "\n\t>>> Type [bold]drop[/bold] to proceed or any other key to abort"
+                )
+                if user_input.lower() != "drop":
+                    self.reporter.log()
+                    self.reporter.log("Exited without executing any statements")
+                    return False
+
+            self.reporter.log("\n[bold]Executing DDL statements[/bold]:")
+            for object_type in OBJECT_TYPES:
+                self._execute(
+                    object_type,
+                    build_statements_list(self.ddl_statements, [object_type]),
+                )
+            return True
+
+    def get_created_and_dropped_objects(self) -> Dict:
+        """Get names of the objects created or dropped by the last plan, by object type"""
+        with self._lock:
+            return get_created_and_dropped_objects(self.ddl_statements)
+
+    def _execute(self, object_type: str, statements: List[str]) -> None:
+        if not statements:
+            return
+        with self.connection.cursor() as cursor:
+            execute_ddl(cursor, statements, self.reporter)
+        # Statements can change objects of other types too (e.g. dropping a database
+        # drops its schemas), so everything needs to be inspected again
+        self._inspected = {}
+
+    def _log_statements_summary(self, statements_seq: List[str]) -> None:
+        if not statements_seq:
+            self.reporter.log(
+                "No statements to execute (the state of Snowflake objects matches the Permifrost spec)\n"
+            )
+        else:
+            self.reporter.log()
+
+    def _load_spec(self) -> Tuple[dict, Dict]:
+        """Load and parse the spec, reusing the cached one if the file did not change"""
+        from yaml import load, Loader
+
+        mtime = os.path.getmtime(self.permifrost_spec_path)
+        if self._spec_cache is None or self._spec_cache[0] != mtime:
+            permifrost_spec = load(open(self.permifrost_spec_path, "r"), Loader=Loader)
+            ought_objects = {
+                object_type: parse_object_type(permifrost_spec, object_type)
+                for object_type in OBJECT_TYPES
+            }
+            self._spec_cache = (mtime, permifrost_spec, ought_objects)
+        return self._spec_cache[1], self._spec_cache[2]
+
+    def _iter_statements(self) -> Iterator[Tuple[str, List[str]]]:
+        """Resolve each object type and yield its statements as soon as they are ready.
+
+        The SHOW queries of all object types that are not cached run concurrently,
+        each one on its own cursor that is closed when it is done, while the spec is loaded and parsed. Object types
+        are yielded in order since statements depend on previous object types (e.g.
+        schemas on databases).
+
+        Yields:
+            object_type, statements: object type and its list of statements, built
+                                     with `build_statements_list`
+        """
+        uninspected_object_types = (
+            CREATE_ONLY_OBJECT_TYPES if self.skip_create_only_inspection else []
+        )
+        self.ddl_statements = {}
+
+        with ThreadPoolExecutor(max_workers=len(OBJECT_TYPES)) as executor:
+            inspections = {}
+            if not self.base_ref:
+                for object_type in OBJECT_TYPES:
+                    if object_type in uninspected_object_types:
+                        continue
+                    inspections[object_type] = self._submit_inspection(
+                        executor, object_type, None
+                    )
+
+            permifrost_spec, ought_objects = self._load_spec()
+
+            if self.base_ref:
+                self.reporter.log(
+                    f"Comparing Permifrost spec against [italic]{self.base_ref}[/italic]"
+                )
+                base_spec = load_spec_at_ref(self.permifrost_spec_path, self.base_ref)
+                ought_objects = dict(ought_objects)
+                for object_type in OBJECT_TYPES:
+                    changed_names = diff_object_type(
+                        base_spec, permifrost_spec, object_type
+                    )
+                    changed_names_lower = {name.lower() for name in changed_names}
+                    ought_objects[object_type] = frozenset(
+                        obj
+                        for obj in ought_objects[object_type]
+                        if obj.name.lower() in changed_names_lower
+                    )
+                    if object_type in uninspected_object_types:
+                        continue
+                    if changed_names:
+                        inspections[object_type] = self._submit_inspection(
+                            executor, object_type, changed_names
+                        )
+                    else:  # Nothing to inspect
+                        inspections[object_type] = None, executor.submit(frozenset)
+
+            for object_type in OBJECT_TYPES:
+                if object_type in uninspected_object_types:
+                    self.reporter.log(
+                        f"Resolving {object_type} objects without inspection"
+                    )
+                    self.ddl_statements[object_type] = resolve_create_only(
+                        ought_objects[object_type], object_type
+                    )
+                else:
+                    key, inspection = inspections[object_type]
+                    existing_objects = inspection.result()
+                    if key is not None:
+                        self._inspected[key] = existing_objects
+                    self.reporter.log(f"Resolving {object_type} objects")
+                    self.ddl_statements[object_type] = self._resolve(
+                        existing_objects, ought_objects[object_type], object_type
+                    )
+                yield object_type, build_statements_list(
+                    self.ddl_statements, [object_type]
+                )
+
+    def _submit_inspection(self, executor, object_type: str, names):
+        """Inspect objects in the executor, or get them from the cache.
+
+        Returns:
+            key, inspection: cache key of the inspection and its future
+        """
+        key = (object_type, frozenset(names) if names is not None else None)
+        if key in self._inspected:
+            return key, executor.submit(self._inspected.get, key)
+
+        # The connection is opened here, as the worker cannot take the lock held by
+        # the calling thread
+        connection = self.connection
+
+        def inspect():
+            with connection.cursor() as cursor:
+                if names is None:
+                    return self._inspect(cursor, object_type)
+                return self._inspect(cursor, object_type, names)
+
+        return key, executor.submit(inspect)
@@ -24,7 +24,7 @@ def parse_schemas(permifrost_spec: dict) -> FrozenSet[Schema]:
     """
     # Keys are databases and values are list of schemas e.g. {'ANALYTICS': ['REPORTING']}
     ought_schemas = {}
-    for role in permifrost_spec["roles"]:
+    for role in permifrost_spec.get("roles") or []:
         role_name, permi_defs = list(role.items())[0]
         if permi_defs.get("owns") and permi_defs["owns"].get("schemas"):
             for schema in permi_defs["owns"]["schemas"]:
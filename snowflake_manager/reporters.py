@@ -0,0 +1,166 @@
+import json
+import re
+import sys
+from abc import ABC, abstractmethod
+from typing import Dict, Type, TextIO
+
+# Matches rich markup tags used in log messages e.g. "[bold]" or "[/italic]"
+MARKUP_PATTERN = re.compile(r"\[/?[a-z ]*\]")
+
+
+def strip_markup(message: str) -> str:
+    return MARKUP_PATTERN.sub("", message)
+
+
+class Reporter(ABC):
+    """Base class for reporting progress, DDL statements and command output.
+
+    Messages passed to `log` may contain rich markup, which reporters that do not
+    render it are expected to strip.
+    """
+
+    @abstractmethod
+    def log(self, message: str = "") -> None:
+        pass
+
+    @abstractmethod
+    def statement(self, statement: str, note: str = None) -> None:
+        """Report a DDL statement that is going to be executed, with an optional note
+        e.g. "may already exist" for idempotent statements"""
+
+    @abstractmethod
+    def executed(self, statement: str) -> None:
+        """Report a DDL statement that was executed successfully"""
+
+    @abstractmethod
+    def output(self, line: str) -> None:
+        """Report a line of output of an external command (e.g. Permifrost)"""
+
+    def ask(self, question: str) -> str:
+        """Ask for user input, with the question written to stderr so that it does not
+        end up in the reported output"""
+        self.flush()
+        sys.stderr.write(strip_markup(question) + " ")
+        sys.stderr.flush()
+        return input()
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class RichReporter(Reporter):
+    """Reports to the terminal with rich formatting and timestamps"""
+
+    def __init__(self):
+        from rich.console import Console
+
+        self.console = Console()
+
+    def log(self, message: str = "") -> None:
+        self.console.log(message)
+
+    def statement(self, statement: str, note: str = None) -> None:
+        if note:
+            self.console.log(
+                f"[italic]- {statement}[/italic] [yellow]({note})[/yellow]"
+            )
+        else:
+            self.console.log(f"[italic]- {statement}[/italic]")
+
+    def executed(self, statement: str) -> None:
+        self.console.log(f"[green]\u2713[/green] [italic]{statement}[/italic]")
+
+    def output(self, line: str) -> None:
+        self.console.log(line)
+
+    def ask(self, question: str) -> str:
+        from rich.prompt import Prompt
+
+        return Prompt.ask(question)
+
+
+class PlainReporter(Reporter):
+    """Reports plain text lines.
+
+    Bursts of statements are buffered and written in chunks, while messages and
+    command output are written right away so that progress shows up live.
+    """
+
+    def __init__(self, stream: TextIO = None, buffer_size: int = 1000):
+        self.stream = stream or sys.stdout
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def write(self, line: str) -> None:
+        self.buffer.append(line)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def log(self, message: str = "") -> None:
+        self.write(strip_markup(message))
+        self.flush()
+
+    def statement(self, statement: str, note: str = None) -> None:
+        if note:
+            self.write(f"- {statement} ({note})")
+        else:
+            self.write(f"- {statement}")
+
+    def executed(self, statement: str) -> None:
+        self.write(f"OK {statement}")
+
+    def output(self, line: str) -> None:
+        self.write(line)
+        self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.buffer.append("")
+            self.stream.write("\n".join(self.buffer))
+            self.buffer = []
+        self.stream.flush()
+
+
+class JsonlReporter(Reporter):
+    """Streams one JSON object per line, for machine consumption"""
+
+    def __init__(self, stream: TextIO = None):
+        self.stream = stream or sys.stdout
+
+    def emit(self, event: str, **fields) -> None:
+        self.stream.write(json.dumps({"event": event, **fields}) + "\n")
+
+    def log(self, message: str = "") -> None:
+        message = strip_markup(message).strip()
+        if message:
+            self.emit("message", message=message)
+
+    def statement(self, statement: str, note: str = None) -> None:
+        if note:
+            self.emit("statement", sql=statement, note=note)
+        else:
+            self.emit("statement", sql=statement)
+
+    def executed(self, statement: str) -> None:
+        self.emit("executed", sql=statement)
+
+    def output(self, line: str) -> None:
+        self.emit("output", line=line)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+REPORTERS: Dict[str, Type[Reporter]] = {
+    "rich": RichReporter,
+    "plain": PlainReporter,
+    "jsonl": JsonlReporter,
+}
+
+
+def get_reporter(name: str = "rich") -> Reporter:
+    """Initialize a reporter by name, one of the keys of `REPORTERS`"""
+    return REPORTERS[name]()
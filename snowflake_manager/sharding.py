@@ -0,0 +1,90 @@
+import heapq
+from typing import Dict, List
+
+
+def get_entity_names(permifrost_spec: dict, entity_type: str) -> List[str]:
+    """Get names of the entities of a given type (e.g. "roles") in the Permifrost spec"""
+    return [list(entity.keys())[0] for entity in permifrost_spec.get(entity_type) or []]
+
+
+def shard_roles(permifrost_spec: dict, n_shards: int) -> List[List[str]]:
+    """Split the roles of a Permifrost spec into balanced shards.
+
+    Roles are assigned greedily, largest definition first, to the shard with the
+    smallest total size so far. The size of the definition is used as a proxy of the
+    number of grants Permifrost has to check for the role.
+
+    Args:
+        permifrost_spec: Dict with contents from Permifrost YAML file
+        n_shards: maximum number of shards
+
+    Returns:
+        shards: list of non-empty lists of role names
+    """
+    role_sizes = [
+        (len(str(role[name])), name)
+        for role in permifrost_spec.get("roles") or []
+        for name in role.keys()
+    ]
+    role_sizes.sort(key=lambda item: (-item[0], item[1]))
+
+    # Heap of (total size, shard index) to find the smallest shard quickly
+    heap = [(0, i) for i in range(max(1, min(n_shards, len(role_sizes))))]
+    shards = [[] for _ in heap]
+    for size, name in role_sizes:
+        total_size, i = heapq.heappop(heap)
+        shards[i].append(name)
+        heapq.heappush(heap, (total_size + size, i))
+
+    return [shard for shard in shards if shard]
+
+
+def build_shard_commands(
+    command: List[str],
+    permifrost_spec: dict,
+    n_shards: int,
+    roles: List[str] = None,
+    users: List[str] = None,
+) -> Dict[str, List[str]]:
+    """Build one Permifrost command per shard of roles, plus one for all users.
+
+    Every shard runs against the same spec file, so shared sections (databases,
+    warehouses, users) stay consistent, and uses Permifrost's `--role` and `--user`
+    options to only grant privileges for its own part of the spec.
+
+    Args:
+        command: Permifrost command to run for the whole spec
+        permifrost_spec: Dict with contents from Permifrost YAML file
+        n_shards: maximum number of role shards
+        roles: optional names of the roles to run for, defaults to all roles
+        users: optional names of the users to run for, defaults to all users
+
+    Returns:
+        commands: dict with labels (e.g. "Role shard 1/4" or "Users") as keys and
+                  Permifrost commands as values
+    """
+    if roles is not None:
+        permifrost_spec = {
+            **permifrost_spec,
+            "roles": [
+                role
+                for role in permifrost_spec.get("roles") or []
+                if list(role.keys())[0] in roles
+            ],
+        }
+
+    commands = {}
+    shards = shard_roles(permifrost_spec, n_shards)
+    for i, shard in enumerate(shards):
+        commands[f"Role shard {i + 1}/{len(shards)}"] = command + [
+            arg for role in shard for arg in ["--role", role]
+        ]
+
+    if users is None:
+        users = get_entity_names(permifrost_spec, "users")
+    if users:
+        commands["Users"] = command + [
+            arg for user in users for arg in ["--user", user]
+        ]
+
+    return commands
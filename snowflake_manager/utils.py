@@ -3,29 +3,30 @@ import os
 import re
 import subprocess
 import textwrap
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Type, T
 
-from rich.console import Console
-from rich.logging import RichHandler
-from snowflake.connector import connect
 
-
-logging.basicConfig(
-    level="WARN", format="%(message)s", datefmt="[%X]", handlers=[RichHandler()]
-)
 log = logging.getLogger(__name__)
 log.setLevel("INFO")
-console = Console()
 
 
-def get_snowflake_cursor():
+def get_snowflake_connection():
+    from dotenv import load_dotenv
+    from snowflake.connector import connect
+
+    load_dotenv()
     return connect(
         user=os.getenv("PERMISSION_BOT_USER"),
         password=os.getenv("PERMISSION_BOT_PASSWORD"),
         account=os.getenv("PERMISSION_BOT_ACCOUNT"),
         warehouse=os.getenv("PERMISSION_BOT_WAREHOUSE"),
         database=os.getenv("PERMISSION_BOT_DATABASE"),
-    ).cursor()
+    )
+
+
+def get_snowflake_cursor():
+    return get_snowflake_connection().cursor()
 
 
 def plural(name: str) -> str:
@@ -67,7 +68,7 @@ def format_params(params: Dict) -> str:
     return ", ".join(params_formatted)
 
 
-def run_command(command):
+def run_command(command, reporter):
     process = subprocess.Popen(
         command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
     )
@@ -78,7 +79,7 @@ def run_command(command):
         if output == "" and process.poll() is not None:
             break
         if output:
-            console.log(output.strip())
+            reporter.output(output.strip())
 
     # Check for errors
     output, errs = process.communicate()
@@ -87,7 +88,70 @@ def run_command(command):
     return output, errs
 
 
-def log_dry_run_info():
-    console.log(20 * "-")
-    console.log("[bold]Executing in [yellow]dry run mode[/yellow][/bold]")
-    console.log(20 * "-")
+class ParallelCommandsError(Exception):
+    """Raised when commands run in parallel failed, with the exit code of each one"""
+
+    def __init__(self, failures: Dict[str, int]):
+        self.failures = failures
+        super().__init__(
+            "Commands failed: "
+            + ", ".join(
+                f"{label} (exit code {code})" for label, code in failures.items()
+            )
+        )
+
+
+def run_commands_in_parallel(commands, reporter, max_workers=None):
+    """Run commands concurrently in separate processes with a bounded pool.
+
+    The output of each command, including its standard error, is reported as a block
+    once it finishes, so the output of concurrent commands is not interleaved.
+
+    Args:
+        commands: dict with labels as keys and commands, each one a list of
+                  arguments, as values
+        reporter: reporter used to output the commands' output
+        max_workers: maximum number of commands running at the same time, defaults
+                     to running all of them at once
+
+    Raises:
+        ParallelCommandsError: if any of the commands failed, for all the ones that did
+    """
+    max_workers = max_workers or len(commands)
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                subprocess.run,
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            ): label
+            for label, command in commands.items()
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            process = future.result()
+            if process.returncode == 0:
+                reporter.log(f"[bold]{label}[/bold] finished:")
+            else:
+                failures[label] = process.returncode
+                reporter.log(
+                    f"[bold]{label}[/bold] [red]failed[/red] with exit code {process.returncode}:"
+                )
+            for line in (process.stdout + process.stderr).splitlines():
+                if line.strip():
+                    reporter.output(line.strip())
+
+    if failures:
+        # Same order as the commands, regardless of which one finished first
+        raise ParallelCommandsError(
+            {label: failures[label] for label in commands if label in failures}
+        )
+
+
+def log_dry_run_info(reporter):
+    reporter.log(20 * "-")
+    reporter.log("[bold]Executing in [yellow]dry run mode[/yellow][/bold]")
+    reporter.log(20 * "-")
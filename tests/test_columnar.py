@@ -0,0 +1,105 @@
+from decimal import Decimal
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from snowflake_manager.columnar import (
+    encode_column,
+    encode_value,
+    resolve_objects_columnar,
+)
+from snowflake_manager.core import resolve_objects
+from snowflake_manager.objects import Schema, Warehouse
+from snowflake_manager.utils import treat_metadata_value
+
+
+def test_encode_column_matches_encode_value():
+    raw_values = [" X-Small ", "TRUE", "false", "standard", None]
+    encoded = encode_column(pa.array(raw_values)).to_pylist()
+    assert encoded == [encode_value(treat_metadata_value(v)) for v in raw_values]
+
+    assert encode_column(pa.array([60, None])).to_pylist() == ["n:60", "none"]
+    numbers = [Decimal("60.00"), Decimal("0.50"), None]
+    assert encode_column(pa.array(numbers, pa.decimal128(10, 2))).to_pylist() == [
+        encode_value(60),
+        encode_value(0.5),
+        "none",
+    ]
+    assert encode_column(pa.array([60.0, 0.5, 3600.0])).to_pylist() == [
+        encode_value(60),
+        encode_value(0.5),
+        encode_value(3600),
+    ]
+    assert encode_value(60) == encode_value(60.0) == "n:60"
+    assert encode_value(True) == "n:1"
+    assert encode_value("60") != encode_value(60)
+
+
+def test_resolve_objects_columnar_matches_resolve_objects():
+    ought_objects = frozenset(
+        [
+            Warehouse(
+                name="load",
+                params={
+                    "warehouse_size": "x-small",
+                    "auto_suspend": 60,
+                    "auto_resume": True,
+                    "initially_suspended": True,  # Ignored in ALTER statements
+                },
+            ),
+            Warehouse(
+                name="transform",
+                params={"warehouse_size": "small", "auto_suspend": 60},
+            ),
+            Warehouse(name="report", params={"warehouse_size": "x-small"}),
+        ]
+    )
+    existing_table = pa.table(
+        {
+            "name": ["load", "transform", "old"],
+            "warehouse_size": encode_column(pa.array(["X-Small", "X-Small", "Small"])),
+            "auto_suspend": encode_column(pa.array([60, 600, 60])),
+            "auto_resume": encode_column(pa.array(["true", "true", "false"])),
+        }
+    )
+    existing_objects = frozenset(
+        [
+            Warehouse(
+                name=name,
+                params={
+                    "warehouse_size": size,
+                    "auto_suspend": auto_suspend,
+                    "auto_resume": auto_resume,
+                },
+            )
+            for name, size, auto_suspend, auto_resume in [
+                ("load", "x-small", 60, True),
+                ("transform", "x-small", 600, True),
+                ("old", "small", 60, False),
+            ]
+        ]
+    )
+
+    statements = resolve_objects_columnar(existing_table, ought_objects, "warehouse")
+    expected_statements = resolve_objects(existing_objects, ought_objects)
+    assert statements["drop"] == expected_statements["drop"]
+    assert statements["create"] == expected_statements["create"]
+    assert statements["changed_names"] == expected_statements["changed_names"]
+    assert statements["alter"] == [
+        "USE ROLE PERMIFROST;ALTER warehouse transform SET auto_suspend = 60, warehouse_size = 'small';"
+    ]
+    assert len(expected_statements["alter"]) == 1
+
+
+def test_resolve_objects_columnar_schemas_are_not_dropped():
+    existing_table = pa.table({"name": ["RAW.STRIPE", "RAW.OLD"]})
+    ought_objects = frozenset([Schema(name="RAW.STRIPE"), Schema(name="RAW.HUBSPOT")])
+
+    statements = resolve_objects_columnar(existing_table, ought_objects, "schema")
+    assert statements == {
+        "drop": [],
+        "create": ["USE ROLE PERMIFROST;CREATE schema RAW.HUBSPOT ;"],
+        "alter": [],
+        "changed_names": ["RAW.HUBSPOT"],
+    }
@@ -1,4 +1,14 @@
-from snowflake_manager.core import build_statements_list
+import io
+
+from snowflake_manager.core import (
+    build_statements_list,
+    execute_ddl,
+    get_created_and_dropped_objects,
+    resolve_create_only,
+    resolve_objects,
+)
+from snowflake_manager.objects import Database, Schema, Warehouse
+from snowflake_manager.reporters import PlainReporter
 
 
 def test_build_statements_list():
@@ -44,3 +54,80 @@ def test_build_statements_list():
     ]
 
     assert result == expected_output
+
+
+def test_get_created_and_dropped_objects():
+    test_statements = {
+        "database": resolve_objects(
+            frozenset([Database(name="old_raw"), Database(name="analytics")]),
+            frozenset([Database(name="raw"), Database(name="analytics")]),
+        ),
+        "warehouse": resolve_objects(
+            frozenset([Warehouse(name="load", params={"auto_suspend": 600})]),
+            frozenset([Warehouse(name="load", params={"auto_suspend": 60})]),
+        ),
+        # Uninspected schemas that may already exist are not included
+        "schema": resolve_create_only(frozenset([Schema(name="RAW.STRIPE")]), "schema"),
+        "user": None,
+    }
+
+    assert get_created_and_dropped_objects(test_statements) == {
+        "database": {"old_raw", "raw"},
+        "warehouse": set(),
+        "schema": set(),
+    }
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.requests = []
+
+    def execute(self, statement, num_statements=1):
+        self.requests.append((statement, num_statements))
+
+
+def test_resolve_create_only():
+    ought_objects = frozenset([Schema(name="RAW.STRIPE"), Schema(name="RAW.HUBSPOT")])
+    assert resolve_create_only(ought_objects, "schema") == {
+        "drop": [],
+        "create": [
+            "USE ROLE PERMIFROST;CREATE schema IF NOT EXISTS RAW.HUBSPOT ;",
+            "USE ROLE PERMIFROST;CREATE schema IF NOT EXISTS RAW.STRIPE ;",
+        ],
+        "alter": [],
+        "changed_names": [],
+    }
+
+
+def test_execute_ddl_batches_create_if_not_exists(monkeypatch):
+    monkeypatch.setattr("snowflake_manager.core.ddl_batch_size", 4)
+    statements = [
+        "USE ROLE admin",
+        "CREATE DATABASE raw",
+        "USE ROLE admin",
+        "CREATE SCHEMA IF NOT EXISTS RAW.A",
+        "USE ROLE admin",
+        "CREATE SCHEMA IF NOT EXISTS RAW.B",
+        "USE ROLE admin",
+        "CREATE SCHEMA IF NOT EXISTS RAW.C",
+    ]
+    cursor = RecordingCursor()
+    reporter = PlainReporter(stream=io.StringIO())
+    execute_ddl(cursor, statements, reporter)
+
+    assert cursor.requests == [
+        ("USE ROLE admin", 1),
+        ("CREATE DATABASE raw", 1),
+        (
+            "USE ROLE admin;CREATE SCHEMA IF NOT EXISTS RAW.A;"
+            "USE ROLE admin;CREATE SCHEMA IF NOT EXISTS RAW.B",
+            4,
+        ),
+        ("USE ROLE admin;CREATE SCHEMA IF NOT EXISTS RAW.C", 2),
+    ]
+    assert reporter.buffer == [
+        "OK CREATE DATABASE raw",
+        "OK CREATE SCHEMA IF NOT EXISTS RAW.A",
+        "OK CREATE SCHEMA IF NOT EXISTS RAW.B",
+        "OK CREATE SCHEMA IF NOT EXISTS RAW.C",
+    ]
@@ -0,0 +1,57 @@
+import subprocess
+
+import pytest
+from yaml import load, Loader
+
+from snowflake_manager.differ import diff_object_type, load_spec_at_ref
+
+
+def load_specs():
+    base_spec = load(open("tests/data/base_spec.yml", "r"), Loader=Loader)
+    head_spec = load(open("tests/data/head_spec.yml", "r"), Loader=Loader)
+    return base_spec, head_spec
+
+
+def test_diff_object_type_added_objects():
+    base_spec, head_spec = load_specs()
+    assert diff_object_type(base_spec, head_spec, "database") == {"sandbox"}
+    assert diff_object_type(base_spec, head_spec, "schema") == {"RAW.HUBSPOT"}
+
+
+def test_diff_object_type_removed_objects():
+    base_spec, head_spec = load_specs()
+    assert diff_object_type(head_spec, base_spec, "database") == {"sandbox"}
+
+
+def test_diff_object_type_changed_params():
+    base_spec, head_spec = load_specs()
+    assert diff_object_type(base_spec, head_spec, "warehouse") == {"transform"}
+
+
+def test_diff_object_type_unchanged():
+    base_spec, head_spec = load_specs()
+    assert diff_object_type(base_spec, head_spec, "role") == frozenset()
+    assert diff_object_type(head_spec, head_spec, "warehouse") == frozenset()
+
+
+def init_git_repo(path):
+    git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+    subprocess.run(git + ["init", "-q"], cwd=path, check=True)
+    subprocess.run(
+        git + ["commit", "-q", "--allow-empty", "-m", "base"], cwd=path, check=True
+    )
+
+
+def test_load_spec_at_ref_missing_file(tmp_path, monkeypatch):
+    init_git_repo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "permifrost.yml").write_text("databases: []\n")
+    assert load_spec_at_ref("permifrost.yml", "HEAD") == {}
+    assert diff_object_type({}, {"roles": []}, "schema") == frozenset()
+
+
+def test_load_spec_at_ref_missing_ref(tmp_path, monkeypatch):
+    init_git_repo(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="origin/main"):
+        load_spec_at_ref("permifrost.yml", "origin/main")
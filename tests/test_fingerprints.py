@@ -0,0 +1,92 @@
+import copy
+
+from yaml import load, Loader
+
+from snowflake_manager.core import get_created_and_dropped_objects, resolve_create_only
+from snowflake_manager.fingerprints import (
+    compute_fingerprints,
+    get_entities_to_run,
+    get_role_references,
+    load_fingerprints,
+    save_fingerprints,
+)
+from snowflake_manager.parser import parse_object_type
+
+
+def load_spec():
+    return load(open("tests/data/base_spec.yml", "r"), Loader=Loader)
+
+
+def test_get_role_references():
+    permifrost_spec = load_spec()
+    references = get_role_references(permifrost_spec["roles"][1]["transformer"])
+    assert references == {
+        "warehouse": {"transform"},
+        "database": {"raw", "analytics"},
+        "schema": {"raw.stripe", "analytics.reporting"},
+        "role": set(),
+    }
+
+
+def test_unchanged_spec_runs_nothing():
+    permifrost_spec = load_spec()
+    fingerprints = compute_fingerprints(permifrost_spec)
+    assert get_entities_to_run(permifrost_spec, fingerprints, fingerprints) == {
+        "roles": [],
+        "users": [],
+    }
+
+
+def test_changed_role_and_referenced_objects():
+    permifrost_spec = load_spec()
+    previous_fingerprints = compute_fingerprints(permifrost_spec)
+
+    # Changing a referenced warehouse changes the fingerprint of the role using it
+    changed_spec = copy.deepcopy(permifrost_spec)
+    changed_spec["warehouses"][0]["load"]["meta"]["auto_suspend"] = 120
+    fingerprints = compute_fingerprints(changed_spec)
+    entities = get_entities_to_run(changed_spec, previous_fingerprints, fingerprints)
+    assert entities == {"roles": ["loader"], "users": []}
+
+    changed_spec["users"] = [{"bob": {"member_of": ["loader"]}}]
+    fingerprints = compute_fingerprints(changed_spec)
+    entities = get_entities_to_run(changed_spec, previous_fingerprints, fingerprints)
+    assert entities == {"roles": ["loader"], "users": ["bob"]}
+
+
+def test_roles_affected_by_created_objects():
+    permifrost_spec = load_spec()
+    fingerprints = compute_fingerprints(permifrost_spec)
+
+    # The loader role owns all schemas in the raw database
+    entities = get_entities_to_run(
+        permifrost_spec, fingerprints, fingerprints, {"schema": {"RAW.HUBSPOT"}}
+    )
+    assert entities == {"roles": ["loader"], "users": []}
+
+    entities = get_entities_to_run(
+        permifrost_spec, fingerprints, fingerprints, {"database": {"analytics"}}
+    )
+    assert entities == {"roles": ["transformer"], "users": []}
+
+
+def test_save_and_load_fingerprints(tmp_path):
+    fingerprints_path = str(tmp_path / "fingerprints.json")
+    assert load_fingerprints(fingerprints_path) is None
+
+    fingerprints = compute_fingerprints(load_spec())
+    save_fingerprints(fingerprints_path, fingerprints)
+    assert load_fingerprints(fingerprints_path) == fingerprints
+
+
+def test_get_entities_to_run_skips_uninspected_schemas():
+    permifrost_spec = load_spec()
+    fingerprints = compute_fingerprints(permifrost_spec)
+    ought_schemas = parse_object_type(permifrost_spec, "schema")
+    changed_objects = get_created_and_dropped_objects(
+        {"schema": resolve_create_only(ought_schemas, "schema")}
+    )
+
+    assert get_entities_to_run(
+        permifrost_spec, fingerprints, fingerprints, changed_objects
+    ) == {"roles": [], "users": []}
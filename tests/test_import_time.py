@@ -0,0 +1,48 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parents[1]
+
+# Modules that should only be loaded by the subcommands that need them
+HEAVY_MODULES = ["snowflake.connector", "rich", "yaml", "dotenv"]
+
+# Generous budget in microseconds for importing the CLI entry point
+CLI_IMPORT_BUDGET_US = 300_000
+
+
+def get_import_times(module: str) -> dict:
+    """Import a module in a fresh interpreter and parse `python -X importtime` output.
+
+    Returns:
+        import_times: dict with imported module names as keys and their cumulative
+                      import time in microseconds as values
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+@pytest.mark.parametrize("module", ["snowflake_manager", "snowflake_manager.cli"])
+def test_no_heavy_imports(module):
+    import_times = get_import_times(module)
+    for heavy_module in HEAVY_MODULES:
+        assert heavy_module not in import_times
+
+
+def test_cli_import_time():
+    import_times = get_import_times("snowflake_manager.cli")
+    assert import_times["snowflake_manager.cli"] < CLI_IMPORT_BUDGET_US
@@ -0,0 +1,171 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from snowflake_manager.manager import SnowflakeManager
+from snowflake_manager.reporters import PlainReporter
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+class FakeCursor:
+    """Cursor of an empty Snowflake account, recording executed statements"""
+
+    description = [("name",)]
+
+    def __init__(self, statements):
+        self.statements = statements
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def execute(self, statement, num_statements=1):
+        self.statements.append(statement)
+
+    def __iter__(self):
+        return iter([])
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+        self.cursors = []
+        self.closed = False
+
+    def cursor(self):
+        self.cursors.append(FakeCursor(self.statements))
+        return self.cursors[-1]
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+def get_manager(connections, connection_class=FakeConnection):
+    def connection_factory():
+        connections.append(connection_class())
+        return connections[-1]
+
+    return SnowflakeManager(
+        str(DATA_DIR / "head_spec.yml"),
+        PlainReporter(stream=io.StringIO()),
+        connection_factory=connection_factory,
+    )
+
+
+def count_show_queries(connections):
+    return sum(
+        s.startswith("SHOW")
+        for connection in connections
+        for s in connection.statements
+    )
+
+
+def test_plan_reuses_connection_and_inspections():
+    connections = []
+    manager = get_manager(connections)
+
+    ddl_statements = manager.plan()
+    assert len(connections) == 1
+    assert count_show_queries(connections) == 5
+    assert (
+        "USE ROLE PERMIFROST;CREATE database raw ;"
+        in ddl_statements["database"]["create"]
+    )
+
+    assert manager.plan() == ddl_statements
+    assert len(connections) == 1
+    assert count_show_queries(connections) == 5
+
+    manager.refresh()
+    manager.plan()
+    assert count_show_queries(connections) == 10
+
+
+def test_apply_invalidates_inspections():
+    connections = []
+    manager = get_manager(connections)
+
+    assert manager.apply(confirm_drops=False)
+    assert "CREATE database raw" in connections[0].statements
+    assert "raw" in manager.get_created_and_dropped_objects()["database"]
+
+    # Objects changed, so they are inspected again
+    manager.plan()
+    assert count_show_queries(connections) == 10
+    assert all(cursor.closed for cursor in connections[0].cursors)
+
+
+def test_close_and_reconnect():
+    connections = []
+    with get_manager(connections) as manager:
+        manager.plan()
+    assert connections[0].closed
+
+    manager.refresh()
+    manager.plan()
+    assert len(connections) == 2
+
+
+class FailingUsersConnection(FakeConnection):
+    def cursor(self):
+        cursor = super().cursor()
+        execute = cursor.execute
+
+        def execute_or_fail(statement, num_statements=1):
+            if statement == "SHOW users":
+                raise PermissionError("Insufficient privileges to operate on account")
+            execute(statement, num_statements)
+
+        cursor.execute = execute_or_fail
+        return cursor
+
+
+def test_apply_in_ci_run(monkeypatch):
+    monkeypatch.setenv("CI", "true")
+    connections = []
+    manager = get_manager(connections)
+    assert manager.apply()
+
+    # Statements are executed in object type order, after all of them are printed
+    executed = [
+        s for s in connections[0].statements if not s.startswith(("SHOW", "USE"))
+    ]
+    assert [s.split()[1] for s in executed] == sorted(
+        [s.split()[1] for s in executed],
+        key=["warehouse", "database", "user", "role", "schema"].index,
+    )
+    assert "CREATE database raw" in executed
+    assert "CREATE schema RAW.STRIPE" in executed
+
+    manager.reporter.flush()
+    lines = manager.reporter.stream.getvalue().splitlines()
+    assert lines[0] == "CI run detected: Skipping DROP confirmation"
+    assert max(i for i, line in enumerate(lines) if line.startswith("- ")) < min(
+        i for i, line in enumerate(lines) if line.startswith("OK ")
+    )
+    assert [line[len("OK ") :] for line in lines if line.startswith("OK ")] == executed
+
+
+def test_apply_does_not_execute_if_an_inspection_fails(monkeypatch):
+    monkeypatch.setenv("CI", "true")
+    connections = []
+    manager = get_manager(connections, FailingUsersConnection)
+    with pytest.raises(PermissionError):
+        manager.apply()
+    assert not any(s.startswith("CREATE") for s in connections[0].statements)
+    assert all(cursor.closed for cursor in connections[0].cursors)
+
+
+def test_columnar_with_base_ref_is_rejected():
+    with pytest.raises(ValueError):
+        SnowflakeManager(
+            str(DATA_DIR / "head_spec.yml"), base_ref="origin/main", columnar=True
+        )
@@ -0,0 +1,96 @@
+import io
+import json
+
+import pytest
+
+from snowflake_manager.reporters import (
+    JsonlReporter,
+    PlainReporter,
+    Reporter,
+    strip_markup,
+)
+
+
+def test_strip_markup():
+    assert strip_markup("[bold][purple]Permifrost[/purple] started[/bold]") == (
+        "Permifrost started"
+    )
+    assert strip_markup("[green]✓[/green] CREATE DATABASE raw") == (
+        "✓ CREATE DATABASE raw"
+    )
+    assert strip_markup("[SUCCESS] GRANT ROLE loader") == "[SUCCESS] GRANT ROLE loader"
+
+
+def test_plain_reporter_buffers_statements():
+    stream = io.StringIO()
+    reporter = PlainReporter(stream=stream, buffer_size=3)
+    reporter.statement("CREATE DATABASE raw")
+    reporter.executed("CREATE DATABASE raw")
+    assert stream.getvalue() == ""
+
+    # Messages and command output are written right away, with buffered statements
+    reporter.log("[bold]Resolving schema objects[/bold]")
+    assert stream.getvalue().splitlines() == [
+        "- CREATE DATABASE raw",
+        "OK CREATE DATABASE raw",
+        "Resolving schema objects",
+    ]
+
+    reporter.output("[SUCCESS] GRANT ROLE loader")
+    assert stream.getvalue().splitlines()[-1] == "[SUCCESS] GRANT ROLE loader"
+    reporter.close()
+
+
+def test_jsonl_reporter():
+    stream = io.StringIO()
+    reporter = JsonlReporter(stream=stream)
+    reporter.log()
+    reporter.log("[bold]Executing DDL statements[/bold]:")
+    reporter.statement("CREATE DATABASE raw")
+    reporter.executed("CREATE DATABASE raw")
+    reporter.close()
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {"event": "message", "message": "Executing DDL statements:"},
+        {"event": "statement", "sql": "CREATE DATABASE raw"},
+        {"event": "executed", "sql": "CREATE DATABASE raw"},
+    ]
+
+
+def test_statement_notes():
+    stream = io.StringIO()
+    reporter = PlainReporter(stream=stream)
+    reporter.statement(
+        "CREATE schema IF NOT EXISTS RAW.STRIPE", note="may already exist"
+    )
+    reporter.close()
+    assert stream.getvalue() == (
+        "- CREATE schema IF NOT EXISTS RAW.STRIPE (may already exist)\n"
+    )
+
+    stream = io.StringIO()
+    reporter = JsonlReporter(stream=stream)
+    reporter.statement(
+        "CREATE schema IF NOT EXISTS RAW.STRIPE", note="may already exist"
+    )
+    assert json.loads(stream.getvalue()) == {
+        "event": "statement",
+        "sql": "CREATE schema IF NOT EXISTS RAW.STRIPE",
+        "note": "may already exist",
+    }
+
+
+def test_ask_writes_question_to_stderr(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("drop\n"))
+    stream = io.StringIO()
+    reporter = JsonlReporter(stream=stream)
+    assert reporter.ask("Type [bold]drop[/bold] to proceed") == "drop"
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == "Type drop to proceed "
+    assert stream.getvalue() == ""
+
+
+def test_reporter_is_abstract():
+    with pytest.raises(TypeError):
+        Reporter()
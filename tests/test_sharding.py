@@ -0,0 +1,30 @@
+from yaml import load, Loader
+
+from snowflake_manager.sharding import build_shard_commands, shard_roles
+
+
+def test_shard_roles():
+    permifrost_spec = load(open("examples/permifrost.yml", "r"), Loader=Loader)
+    all_roles = [list(role.keys())[0] for role in permifrost_spec["roles"]]
+
+    shards = shard_roles(permifrost_spec, 3)
+    assert len(shards) == 3
+    assert sorted(role for shard in shards for role in shard) == sorted(all_roles)
+
+    # Never more shards than roles
+    assert len(shard_roles(permifrost_spec, 1000)) == len(all_roles)
+    assert shard_roles({"roles": []}, 3) == []
+
+
+def test_build_shard_commands():
+    permifrost_spec = load(open("tests/data/base_spec.yml", "r"), Loader=Loader)
+    permifrost_spec["users"] = [{"bob": {"member_of": ["loader"]}}]
+    commands = build_shard_commands(
+        ["permifrost", "run", "spec.yml"], permifrost_spec, 2
+    )
+    assert list(commands) == ["Role shard 1/2", "Role shard 2/2", "Users"]
+    assert sorted(commands.values()) == [
+        ["permifrost", "run", "spec.yml", "--role", "loader"],
+        ["permifrost", "run", "spec.yml", "--role", "transformer"],
+        ["permifrost", "run", "spec.yml", "--user", "bob"],
+    ]
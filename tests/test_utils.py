@@ -1,6 +1,16 @@
+import io
+import sys
+
 import pytest
 
-from snowflake_manager.utils import plural, treat_metadata_value, format_params
+from snowflake_manager.reporters import PlainReporter
+from snowflake_manager.utils import (
+    ParallelCommandsError,
+    plural,
+    treat_metadata_value,
+    format_params,
+    run_commands_in_parallel,
+)
 
 
 def test_plural():
@@ -29,3 +39,36 @@ def test_format_params():
     assert (
         format_params({"name": True, "value": "False"}) == "name = True, value = False"
     )
+
+
+def test_run_commands_in_parallel():
+    reporter = PlainReporter(stream=io.StringIO())
+    commands = {
+        f"Shard {i}": [sys.executable, "-c", f"print('shard {i}')"] for i in range(3)
+    }
+    run_commands_in_parallel(commands, reporter, max_workers=2)
+    lines = reporter.stream.getvalue().splitlines()
+    assert sorted(line for line in lines if not "finished" in line) == [
+        "shard 0",
+        "shard 1",
+        "shard 2",
+    ]
+
+
+def test_run_commands_in_parallel_failures():
+    reporter = PlainReporter(stream=io.StringIO())
+    fail = "import sys; print('error in {}', file=sys.stderr); sys.exit({})"
+    commands = {
+        "Shard 1": [sys.executable, "-c", fail.format("shard 1", 2)],
+        "Shard 2": [sys.executable, "-c", "print('ok')"],
+        "Users": [sys.executable, "-c", fail.format("users", 3)],
+    }
+    with pytest.raises(ParallelCommandsError) as exc:
+        run_commands_in_parallel(commands, reporter)
+    assert exc.value.failures == {"Shard 1": 2, "Users": 3}
+    assert "Shard 1 (exit code 2), Users (exit code 3)" in str(exc.value)
+
+    lines = reporter.stream.getvalue().splitlines()
+    assert "error in shard 1" in lines
+    assert "error in users" in lines
+    assert "Users failed with exit code 3:" in lines